@@ -1,8 +1,22 @@
+import hashlib
+import hmac
+import io
 import os
-from flask import Flask, render_template, request, redirect, url_for, session, flash
+import re
+import shutil
+import tempfile
+import time
+from flask import Flask, render_template, stream_template, make_response, request, redirect, url_for, session, flash
 from flask_sqlalchemy import SQLAlchemy
-from datetime import datetime, timezone
-from werkzeug.security import generate_password_hash, check_password_hash
+from flask_session import Session
+import redis
+from sqlalchemy import tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import joinedload, load_only, raiseload
+import bcrypt
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from werkzeug.security import check_password_hash
 import cloudinary
 import cloudinary.uploader
 from dotenv import load_dotenv
@@ -21,11 +35,30 @@ if raw_db_url and raw_db_url.startswith('postgres://'):
 
 app.config.update(
     UPLOAD_FOLDER=os.path.join(basedir, 'static', 'lost_items'),
+    MAX_CONTENT_LENGTH=16 * 1024 * 1024,  # 单次上传不超过 16MiB
     SQLALCHEMY_TRACK_MODIFICATIONS=False,
+    # 连接池：pre_ping 用 SELECT 1 替代失效连接上的首个查询报错，LIFO 让常用连接保持热
+    SQLALCHEMY_ENGINE_OPTIONS={
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 20)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 10)),
+        'pool_pre_ping': True,
+        'pool_recycle': 1800,
+        'pool_use_lifo': True,
+    },
     SQLALCHEMY_DATABASE_URI=raw_db_url,
+    BCRYPT_ROUNDS=int(os.environ.get('BCRYPT_ROUNDS', 10)),
     DEBUG=os.environ.get('FLASK_DEBUG', 'False') == 'True'
 )
 
+# 配置了 REDIS_URL 时会话存到 Redis，cookie 里只剩随机会话 id；否则沿用 Flask 的签名 cookie
+redis_url = os.environ.get('REDIS_URL')
+if redis_url:
+    app.config.update(
+        SESSION_TYPE='redis',
+        SESSION_REDIS=redis.from_url(redis_url),
+    )
+    Session(app)
+
 # Configure Cloudinary
 cloudinary.config(
     cloud_name=os.getenv('CLOUDINARY_CLOUD_NAME'),
@@ -35,6 +68,81 @@ cloudinary.config(
 
 db = SQLAlchemy(app)
 
+# ==================== Password Hashing ====================
+# bcrypt 只处理密码的前 72 个字节（bcrypt 5 起超长直接抛 ValueError）
+BCRYPT_MAX_BYTES = 72
+
+
+def password_too_long(password):
+    return len(password.encode('utf-8')) > BCRYPT_MAX_BYTES
+
+
+def hash_password(password):
+    """bcrypt 哈希，cost 取 BCRYPT_ROUNDS（在生产机上校准到单次校验约 80ms）"""
+    # bcrypt 计算时会释放 GIL，配合 Procfile 里的 gthread worker，
+    # 同一进程的其他线程在哈希期间照常处理请求，所以直接在请求线程里算
+    salt = bcrypt.gensalt(rounds=app.config['BCRYPT_ROUNDS'])
+    return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+
+def verify_password(user, password):
+    """校验密码；旧的 werkzeug 哈希校验通过后就地升级为 bcrypt"""
+    if user.password_hash.startswith('$2'):
+        if password_too_long(password):
+            # 超长密码不可能是注册时设置的密码，按校验失败处理，耗时与正常校验一致
+            return verify_dummy_password(password)
+        return bcrypt.checkpw(password.encode('utf-8'), user.password_hash.encode('utf-8'))
+    if not check_password_hash(user.password_hash, password):
+        return False
+    # bcrypt 存不下的超长旧密码保留原来的 werkzeug 哈希
+    if not password_too_long(password):
+        user.set_password(password)
+        db.session.commit()
+    return True
+
+
+# 账号不存在时用来空跑一次校验的哈希，每次登录都恰好做一次 bcrypt 校验
+DUMMY_HASH = hash_password(os.urandom(16).hex()).encode('utf-8')
+
+
+def verify_dummy_password(password):
+    """空跑一次 bcrypt 校验并返回 False，使登录耗时与账号是否存在无关"""
+    bcrypt.checkpw(password.encode('utf-8')[:BCRYPT_MAX_BYTES], DUMMY_HASH)
+    return False
+
+
+# 管理员账号从环境变量读取，ADMIN_PW_HASH 为 bcrypt 哈希；未配置时管理员无法登录
+ADMIN_EMAIL = os.environ.get('ADMIN_EMAIL', '').encode('utf-8')
+
+
+def load_admin_pw_hash():
+    """读取 ADMIN_PW_HASH；不是合法的 bcrypt 哈希时记录错误并退回 DUMMY_HASH，避免登录时抛异常"""
+    pw_hash = os.environ.get('ADMIN_PW_HASH', '').encode('utf-8')
+    if not pw_hash:
+        return DUMMY_HASH
+    try:
+        if not pw_hash.startswith(b'$2'):
+            raise ValueError('missing $2 prefix')
+        bcrypt.checkpw(b'', pw_hash)
+    except ValueError as e:
+        app.logger.error(f"ADMIN_PW_HASH is not a valid bcrypt hash ({e}); administrator login is disabled")
+        return DUMMY_HASH
+    return pw_hash
+
+
+ADMIN_PW_HASH = load_admin_pw_hash()
+
+
+# 图片上传到 Cloudinary 是网络往返，放到后台线程里做，请求里只写数据库
+UPLOAD_POOL = ThreadPoolExecutor(max_workers=4)
+
+# 后台上传完成前 image_filename 存 'pending:<提交时间戳>'，上传失败存 'failed'
+IMAGE_PENDING_PREFIX = 'pending:'
+IMAGE_FAILED = 'failed'
+# 超过这个秒数仍未上传完（例如 worker 重启丢了任务）视为失败
+IMAGE_UPLOAD_TIMEOUT = 600
+
+
 # ==================== Models ====================
 class Student(db.Model):
     __tablename__ = 'student'
@@ -45,10 +153,10 @@ class Student(db.Model):
     password_hash = db.Column(db.String(255), nullable=False)
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return verify_password(self, password)
 
 
 class Administrator(db.Model):
@@ -58,10 +166,10 @@ class Administrator(db.Model):
     password_hash = db.Column(db.String(255), nullable=False)
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return verify_password(self, password)
 
 
 class LostItem(db.Model):
@@ -69,35 +177,100 @@ class LostItem(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(255), nullable=False)
     description = db.Column(db.Text, nullable=False)
-    pickup_time = db.Column(db.String(255), nullable=False)
+    pickup_time = db.Column(db.DateTime, nullable=False)
     location = db.Column(db.String(255), nullable=False)
     status = db.Column(db.String(255), nullable=False, default='pending')
     image_filename = db.Column(db.String(500), nullable=False)
 
+    @property
+    def image_state(self):
+        """图片状态：'ready' 已上传，'pending' 后台上传中，'failed' 上传失败或超时"""
+        if self.image_filename.startswith(IMAGE_PENDING_PREFIX):
+            started = float(self.image_filename[len(IMAGE_PENDING_PREFIX):])
+            return 'pending' if time.time() - started < IMAGE_UPLOAD_TIMEOUT else 'failed'
+        if not self.image_filename or self.image_filename == IMAGE_FAILED:
+            return 'failed'
+        return 'ready'
+
     def __repr__(self):
         return f"<LostItem id={self.id} name='{self.name}' status='{self.status}'>"
 
 
+# 列表页按 (pickup_time, id) 倒序做游标分页，用复合索引直接定位
+db.Index('ix_item_pickup_time_id', LostItem.pickup_time.desc(), LostItem.id.desc())
+# 名称模糊搜索 (ILIKE '%关键词%') 走 pg_trgm 的 GIN 索引 ix_item_name_trgm，
+# 它依赖 pg_trgm 扩展，由 templates/调整（PostgreSQL）.sql 创建
+
+
 class Claim(db.Model):
     __tablename__ = 'claim'
     id = db.Column(db.Integer, primary_key=True)
     student_name = db.Column(db.String(255), nullable=False)
     student_id = db.Column(db.String(255), db.ForeignKey('student.student_id'), nullable=False)
-    item_id = db.Column(db.Integer, db.ForeignKey('item.id'), nullable=False)
+    item_id = db.Column(db.Integer, db.ForeignKey('item.id'), nullable=False, index=True)
     phone = db.Column(db.String(255), nullable=False)
-    claim_time = db.Column(db.DateTime, default=datetime.now(timezone.utc))
+    claim_time = db.Column(db.DateTime, default=db.func.now(), server_default=db.func.now())
     status = db.Column(db.String(20), default='pending')
     reason = db.Column(db.String(255))
-    timestamp = db.Column(db.DateTime, default=datetime.now(timezone.utc))
+    timestamp = db.Column(db.DateTime, default=db.func.now(), server_default=db.func.now())
 
     student = db.relationship(Student, backref='claims')
     item = db.relationship(LostItem, backref='claims')
 
+# 认领列表按 (timestamp, id) 倒序做游标分页
+db.Index('ix_claim_timestamp_id', Claim.timestamp.desc(), Claim.id.desc())
+
 
 # ==================== DB Init ====================
 with app.app_context():
     db.create_all()
 
+# ==================== Helpers ====================
+def keyset_paginate(query, per_page, time_column, id_column):
+    """按 (时间列, id) 倒序做游标分页：只做索引定位 + LIMIT，不再执行 COUNT(*)"""
+    after_time = request.args.get('after_time', type=datetime.fromisoformat)
+    after_id = request.args.get('after_id', type=int)
+    if after_time and after_id is not None:
+        query = query.filter(tuple_(time_column, id_column) < (after_time, after_id))
+    # 多取一条，用来判断是否还有下一页
+    rows = (query
+            .order_by(time_column.desc(), id_column.desc())
+            .limit(per_page + 1)
+            .all())
+    items = rows[:per_page]
+    next_cursor = None
+    if len(rows) > per_page:
+        last = items[-1]
+        next_cursor = {'after_time': getattr(last, time_column.key).isoformat(),
+                       'after_id': getattr(last, id_column.key)}
+    return items, next_cursor
+
+
+def search_items_by_name(query, keyword):
+    """忽略大小写的子串匹配 (ILIKE '%关键词%')，由 pg_trgm GIN 索引支撑；% 和 _ 按字面匹配"""
+    return query.filter(LostItem.name.icontains(keyword, autoescape=True))
+
+
+def item_etag(item, *extra):
+    """详情页 ETag：由页面上显示的字段算出，任一字段变化都会让缓存失效"""
+    parts = (item.id, item.name, item.description, item.pickup_time,
+             item.location, item.status, item.image_filename, item.image_state) + extra
+    return hashlib.md5(':'.join(map(str, parts)).encode('utf-8')).hexdigest()
+
+
+def render_conditional(etag, template, **context):
+    """ETag 命中时直接返回 304，跳过模板渲染；有待显示的 flash 消息时照常渲染"""
+    if '_flashes' in session:
+        return render_template(template, **context)
+    if etag in request.if_none_match:
+        response = app.response_class(status=304)
+    else:
+        response = make_response(render_template(template, **context))
+    response.set_etag(etag)
+    # 浏览器可以缓存，但每次都要带 If-None-Match 回来验证
+    response.cache_control.no_cache = True
+    return response
+
 # -----------------------------学生视图---------------------------------
 @app.route('/')
 def index():
@@ -110,7 +283,8 @@ def student_login():
         password = request.form.get('password')
 
         student = Student.query.filter_by(student_id=student_id).first()
-        if student and check_password_hash(student.password_hash,password):
+        pw_ok = student.check_password(password) if student else verify_dummy_password(password)
+        if student and pw_ok:
             session['student_id']=student.student_id
             flash('您已成功登录！')
             return redirect(url_for('student_dashboard'))
@@ -131,24 +305,29 @@ def student_register():
 
         if not all([name,student_id,email,phone,password,confirm_password]):
             flash('请先输入需要填写的信息！')
-            redirect(url_for('student_register'))
-
-        if Student.query.filter_by(student_id=student_id).first():
-            flash('该学生已注册！请直接登录！')
+            return redirect(url_for('student_register'))
 
         if password != confirm_password:
             flash('两次输入的密码不一致！')
             return render_template('student_register.html')
 
-        new_student = Student(
+        if password_too_long(password):
+            flash('密码过长，最多 72 个字节（约 24 个汉字）！')
+            return render_template('student_register.html')
+
+        # 一条 INSERT ... ON CONFLICT DO NOTHING 同时完成查重和写入，并发注册也不会撞主键
+        stmt = insert(Student).values(
             student_id=student_id,
             name = name,
             email = email,
-            phone = phone
-        )
-        new_student.set_password(password)
-        db.session.add(new_student)
+            phone = phone,
+            password_hash = hash_password(password)
+        ).on_conflict_do_nothing(index_elements=['student_id'])
+        result = db.session.execute(stmt)
         db.session.commit()
+        if result.rowcount == 0:
+            flash('该学生已注册！请直接登录！')
+            return redirect(url_for('student_login'))
 
         flash('您已成功注册，请返回首页登录')
         return redirect(url_for('student_login'))
@@ -164,12 +343,16 @@ def student_alterpassword():
         if new_password!=confirm_password:
             flash('两次输入的密码不一致！')
             return redirect(url_for('student_alterpassword'))
+        if password_too_long(new_password):
+            flash('密码过长，最多 72 个字节（约 24 个汉字）！')
+            return redirect(url_for('student_alterpassword'))
 
-        student = Student.query.filter_by(student_id).first()
+        student = Student.query.filter_by(student_id=student_id).first()
         if not student:
             flash ('您输入的学号有误，系统未找到该学生')
             return redirect(url_for('student_alterpassword'))
-        student.password = generate_password_hash(new_password)
+        student.set_password(new_password)
+        db.session.commit()
         flash('您已成功修改密码，请重新登录')
         return redirect(url_for('student_login'))
 
@@ -190,30 +373,26 @@ def student_search_items():
     keyword = request.args.get('keyword', ' ').strip()
     search_mode = False
 
-    # 从数据库中查询记录
-    query = LostItem.query
+    # 从数据库中查询记录，列表页只取卡片需要的列，description 等到详情页再加载
+    query = LostItem.query.options(
+        load_only(LostItem.id, LostItem.name, LostItem.pickup_time, LostItem.image_filename),
+        raiseload('*'))
     if keyword:
-        query = query.filter(LostItem.name.contains(keyword))
-    query = query.order_by(LostItem.pickup_time.desc())
+        query = search_items_by_name(query, keyword)
 
     per_page = 4
-    page = request.args.get('page',1,type=int)
-    pagination = query.paginate(page=page,per_page=per_page,error_out=False)
-
-    items = pagination.items
-    total_pages = pagination.pages
-    current_page = page
+    items, next_cursor = keyset_paginate(query, per_page, LostItem.pickup_time, LostItem.id)
 
-    return render_template('student_search_items.html',
-                           items = items,
-                           currentpage=current_page,
-                           total_pages=total_pages,
-                           search_mode=search_mode)
+    # 边渲染边发送，模板在顶层逐条输出 items
+    return app.response_class(stream_template('student_search_items.html',
+                                              items = items,
+                                              next_cursor=next_cursor,
+                                              search_mode=search_mode))
 
 @app.route('/items/<int:item_id>')
 def items_detail(item_id):
     item = LostItem.query.get_or_404(item_id)
-    return render_template('items_detail.html',item = item)
+    return render_conditional(item_etag(item), 'items_detail.html', item=item)
 
 @app.route('/claim/<int:item_id>',methods=['GET','POST'])
 def claim_item(item_id):
@@ -243,7 +422,12 @@ def administrator_login():
     if request.method == 'POST':
         email = request.form.get('email')
         password = request.form.get('password')
-        if email == 'zhou39506@gmail.com'and password == 'zsj123456':
+        # 邮箱做常量时间比较，且无论邮箱是否正确都做一次 bcrypt 校验，耗时不泄露信息
+        email_ok = bool(ADMIN_EMAIL) and hmac.compare_digest((email or '').encode('utf-8'), ADMIN_EMAIL)
+        password = password or ''
+        pw_ok = (bcrypt.checkpw(password.encode('utf-8')[:BCRYPT_MAX_BYTES], ADMIN_PW_HASH)
+                 and not password_too_long(password))
+        if email_ok and pw_ok:
             flash('您已成功登录！')
             return redirect(url_for('administrator_dashboard'))
         else:
@@ -262,14 +446,76 @@ def administrator_logout():
     flash('您已成功退出登录！')
     return render_template('index.html')
 
-# 工作者上传图片并保存到 Cloudinary
-def upload_image_to_cloudinary(file):
+# 上传文件落盘
+def upload_on_disk(src):
+    """上传流背后是否是磁盘上的真实文件（能用 os.sendfile）"""
+    # werkzeug 用 SpooledTemporaryFile 接收上传，小文件仍在内存 (BytesIO) 里，取 fileno 会强制落盘。
+    # 这里依赖 CPython 的实现细节：溢出到磁盘后 _file 会换成真实的临时文件
+    if isinstance(src, tempfile.SpooledTemporaryFile):
+        return not isinstance(src._file, io.BytesIO)
+    return hasattr(src, 'fileno')
+
+
+def save_upload(file_storage, dst_path):
+    """已溢出到磁盘临时文件的上传用 os.sendfile 在内核里拷贝，其余按 1MiB 分块写入"""
+    src = file_storage.stream
+    src.seek(0, os.SEEK_END)
+    size = src.tell()
+    src.seek(0)
+    with open(dst_path, 'wb') as dst:
+        if upload_on_disk(src):
+            try:
+                src_fd, dst_fd, offset = src.fileno(), dst.fileno(), 0
+                while offset < size:
+                    sent = os.sendfile(dst_fd, src_fd, offset, size - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+                return
+            except (OSError, ValueError, AttributeError):
+                # 平台不支持 sendfile（或流没有真实 fd）时退回普通拷贝
+                src.seek(0)
+                dst.seek(0)
+                dst.truncate()
+        shutil.copyfileobj(src, dst, length=1 << 20)
+
+
+# 工作者上传图片并保存到 Cloudinary（在 UPLOAD_POOL 后台线程中执行）
+def upload_image_to_cloudinary(item_id, tmp_path):
+    try:
+        result = cloudinary.uploader.upload(tmp_path, folder="lost_items")
+    except Exception as e:
+        app.logger.error(f"Cloudinary upload failed for item {item_id}: {str(e)}")
+        result = None
+    finally:
+        os.remove(tmp_path)
+
+    # 回写图片 URL（失败时写入失败标记），在此之前页面显示占位
+    with app.app_context():
+        item = db.session.get(LostItem, item_id)
+        if item is None:
+            # 上传期间失物已被删除，图片不再需要
+            if result is not None:
+                delete_image_from_cloudinary(result.get('secure_url'))
+            return
+        item.image_filename = result.get('secure_url') if result is not None else IMAGE_FAILED
+        db.session.commit()
+
+
+# 从 URL 中取出 public_id，如 .../image/upload/v123/lost_items/abc.png -> lost_items/abc
+CLOUDINARY_PUBLIC_ID = re.compile(r'/upload/(?:v\d+/)?(.+?)(?:\.[^./]+)?$')
+
+
+# 删除 Cloudinary 上的图片（在 UPLOAD_POOL 后台线程中执行）
+def delete_image_from_cloudinary(image_url):
+    match = CLOUDINARY_PUBLIC_ID.search(image_url or '')
+    if not match:
+        app.logger.error(f"Cannot find Cloudinary public_id in {image_url!r}")
+        return
     try:
-        result = cloudinary.uploader.upload(file, folder="lost_items")
-        return result.get('secure_url')
+        cloudinary.uploader.destroy(match.group(1))
     except Exception as e:
-        app.logger.error(f"Cloudinary upload failed: {str(e)}")
-        return None
+        app.logger.error(f"Cloudinary delete failed: {str(e)}")
 
 # 替换 administrator_upload_items 中的图片处理逻辑
 @app.route('/administrator_upload_items', methods=['GET', 'POST'])
@@ -285,9 +531,20 @@ def administrator_upload_items():
             flash('请填写完整所有信息并上传图片')
             return redirect(url_for('administrator_upload_items'))
 
-        image_url = upload_image_to_cloudinary(image_file)
-        if not image_url:
-            flash('图片上传失败，请稍后重试')
+        try:
+            pickup_time = datetime.strptime(pickup_time, '%Y-%m-%dT%H:%M')
+        except ValueError:
+            flash('拾取时间格式不正确，请重新选择')
+            return redirect(url_for('administrator_upload_items'))
+
+        # 先把图片落到本地临时文件，再交给后台线程上传
+        fd, tmp_path = tempfile.mkstemp(suffix=os.path.splitext(image_file.filename)[1])
+        os.close(fd)
+        try:
+            save_upload(image_file, tmp_path)
+        except Exception as e:
+            os.remove(tmp_path)
+            flash(f'图片上传失败: {str(e)}')
             return redirect(url_for('administrator_upload_items'))
 
         new_item = LostItem(
@@ -295,76 +552,72 @@ def administrator_upload_items():
             description=description,
             pickup_time=pickup_time,
             location=location,
-            image_filename=image_url  # 保存 URL
+            image_filename=f'{IMAGE_PENDING_PREFIX}{int(time.time())}'  # 后台上传完成后回写 URL
         )
         db.session.add(new_item)
         db.session.commit()
+        UPLOAD_POOL.submit(upload_image_to_cloudinary, new_item.id, tmp_path)
 
-        flash('失物信息上传成功')
+        flash('失物信息上传成功，图片正在后台上传')
         return redirect(url_for('administrator_dashboard'))
 
     return render_template('administrator_upload_items.html')
 
 @app.route('/administrator_view_claims')
 def administrator_view_claims():
-    # 查询所有的认领申请，按提交时间倒序排列
-    claims = Claim.query.order_by(Claim.timestamp.desc()).all()
-    # 构造一个列表，包含每条申请需要显示的数据（手动组合成字典，方便模板中使用）
-    claim_data = []
-    for claim in claims:
-        claim_data.append({
-            'id': claim.id,
-            'item_name': claim.item.name,        # 失物名称
-            'student_name': claim.student.name,       # 学生姓名
-            'student_id': claim.student.student_id,   # 学号
-            'status': claim.status                    # 认领状态
-        })
-
-    return render_template('administrator_view_claims.html',claims=claim_data)
+    # 分页查询认领申请，按提交时间倒序排列
+    # 用 joinedload 一次 JOIN 取出失物和学生，避免循环里每条申请再各查一次（N+1）；
+    # 其余关系一律 raiseload，以后有人在这里访问未预加载的关系会直接报错而不是悄悄多查
+    query = Claim.query.options(joinedload(Claim.item).raiseload('*'),
+                                joinedload(Claim.student).raiseload('*'),
+                                raiseload('*'))
+
+    per_page = 20
+    claims, next_cursor = keyset_paginate(query, per_page, Claim.timestamp, Claim.id)
+    # 失物和学生已随 JOIN 加载，模板直接访问 claim.item / claim.student，不再额外查询
+    return render_template('administrator_view_claims.html',
+                           claims=claims,
+                           next_cursor=next_cursor)
 
 @app.route('/administrator_view_items', methods=['GET'])
 def administrator_view_items():
     keyword = request.args.get('keyword', ' ').strip()
 
-    # 从数据库中查询记录
-    query = LostItem.query
+    # 从数据库中查询记录，列表页只取卡片需要的列，description 等到详情页再加载
+    query = LostItem.query.options(
+        load_only(LostItem.id, LostItem.name, LostItem.pickup_time, LostItem.image_filename),
+        raiseload('*'))
     if keyword:
-        query = query.filter(LostItem.name.contains(keyword))
-    query = query.order_by(LostItem.pickup_time.desc())
+        query = search_items_by_name(query, keyword)
 
     per_page = 4
-    page = request.args.get('page',1,type=int)
-    pagination = query.paginate(page=page,per_page=per_page,error_out=False)
-
-    items = pagination.items
-    total_pages = pagination.pages
-    current_page = page
+    items, next_cursor = keyset_paginate(query, per_page, LostItem.pickup_time, LostItem.id)
 
-    return render_template('administrator_view_items.html',
-                           items = items,
-                           currentpage=current_page,
-                           total_pages=total_pages)
+    # 边渲染边发送，模板在顶层逐条输出 items
+    return app.response_class(stream_template('administrator_view_items.html',
+                                              items = items,
+                                              next_cursor=next_cursor))
 
 @app.route('/administrator_items_detail/<int:item_id>')
 def administrator_items_detail(item_id):
     item = LostItem.query.get_or_404(item_id)
     # 查询这个 item 的第一条 claim，如果有
     claim = Claim.query.filter_by(item_id=item.id).first()
-    return render_template('administrator_items_detail.html',item=item,claim=claim)
+    return render_conditional(item_etag(item, claim and claim.id),
+                              'administrator_items_detail.html', item=item, claim=claim)
 
 @app.route('/administrator_delete_item/<int:item_id>',methods=['POST'])
 def delete_item(item_id):
     item = LostItem.query.get_or_404(item_id)
-    # 删除与该失物相关的认领记录（如果有的话）
-    claims = Claim.query.filter_by(item_id=item.id).all()
-    for claim in claims:
-        db.session.delete(claim)
+    # 删除与该失物相关的认领记录（如果有的话），一条 DELETE 语句完成，不逐条加载
+    Claim.query.filter_by(item_id=item.id).delete(synchronize_session=False)
 
     # 删除失物记录
     db.session.delete(item)
     db.session.commit()
-    if os.path.exists(item.image_filename):
-        os.remove(item.image_filename)  # 删除图片文件
+    # image_filename 存的是 Cloudinary URL，在后台线程里删除对应资源；图片还没上传完或上传失败的跳过
+    if item.image_state == 'ready':
+        UPLOAD_POOL.submit(delete_image_from_cloudinary, item.image_filename)
 
     flash('您已成功删除该失物和相关认领记录！')
     return redirect(url_for('administrator_view_items'))
@@ -1,2 +1,35 @@
 use zhoushijie_db;
 alter table claim add column timestamp datetime default now();
+
+-- 列表页游标分页用的复合索引
+create index ix_item_pickup_time_id on item (pickup_time desc, id desc);
+
+-- pickup_time 由字符串改为 datetime。旧表单是自由文本输入，修改列类型前要先处理数据：
+-- 1) 把常见写法统一成 'YYYY-MM-DD HH:MM:SS'。只对匹配正则的行调用 str_to_date，
+--    严格模式下 str_to_date 遇到非法值会让整条 update 报错
+update item set pickup_time = str_to_date(pickup_time, '%Y-%m-%d %H:%i')
+    where pickup_time regexp '^[0-9]{4}-[0-9]{1,2}-[0-9]{1,2} [0-9]{1,2}:[0-9]{2}$';
+update item set pickup_time = str_to_date(pickup_time, '%Y-%m-%dT%H:%i')
+    where pickup_time regexp '^[0-9]{4}-[0-9]{1,2}-[0-9]{1,2}T[0-9]{1,2}:[0-9]{2}$';
+update item set pickup_time = str_to_date(pickup_time, '%Y/%m/%d %H:%i')
+    where pickup_time regexp '^[0-9]{4}/[0-9]{1,2}/[0-9]{1,2} [0-9]{1,2}:[0-9]{2}$';
+-- 2) 列出仍不是标准格式的行。有结果时先人工修正，例如
+--    update item set pickup_time = '2025-05-01 10:00:00' where id = ...;
+--    直到这条查询没有结果，再执行第 3 步
+select id, pickup_time from item
+    where pickup_time not regexp '^[0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}:[0-9]{2}$';
+-- 3) 修改列类型；严格模式下仍有非法值时这条语句整体失败，表保持原样
+alter table item modify pickup_time datetime not null;
+
+-- 认领记录按失物查询、按提交时间排序用的索引
+create index ix_claim_item_id on claim (item_id);
+create index ix_claim_timestamp on claim (timestamp);
+-- 失物名称全文索引（ngram 分词，支持中文）
+alter table item add fulltext index ix_item_name_ft (name) with parser ngram;
+
+-- claim_time / timestamp 由数据库在插入时取当前时间
+alter table claim modify claim_time datetime default now();
+
+-- 认领列表改为按 (timestamp, id) 游标分页，复合索引替代单列索引
+drop index ix_claim_timestamp on claim;
+create index ix_claim_timestamp_id on claim (timestamp desc, id desc);
@@ -0,0 +1,26 @@
+-- Render 上 PostgreSQL 数据库的结构调整（对应 app.py），用 psql 按顺序执行
+
+-- pickup_time 由字符串改为 timestamp。旧表单是自由文本输入，修改列类型前要先处理数据：
+-- 1) 列出无法转换成 timestamp 的行。有结果时先人工修正，例如
+--    update item set pickup_time = '2025-05-01 10:00' where id = ...;
+--    直到这条查询没有结果，再执行第 2 步
+create or replace function pg_temp.try_timestamp(v text) returns timestamp as $$
+begin
+    return v::timestamp;
+exception when others then
+    return null;
+end;
+$$ language plpgsql;
+select id, pickup_time from item where pg_temp.try_timestamp(pickup_time) is null;
+-- 2) 修改列类型；仍有无法转换的行时这条语句失败并回滚，表保持原样
+alter table item alter column pickup_time type timestamp using pickup_time::timestamp;
+
+-- 索引。db.create_all() 不会给已存在的表补建索引，已有数据库需要执行下面的语句
+-- 列表页、认领列表按 (时间, id) 倒序做游标分页用的复合索引
+create index if not exists ix_item_pickup_time_id on item (pickup_time desc, id desc);
+create index if not exists ix_claim_timestamp_id on claim (timestamp desc, id desc);
+-- 认领记录按失物查询
+create index if not exists ix_claim_item_id on claim (item_id);
+-- 失物名称模糊搜索 (ILIKE '%关键词%') 用的 trigram 索引
+create extension if not exists pg_trgm;
+create index if not exists ix_item_name_trgm on item using gin (name gin_trgm_ops);